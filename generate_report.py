@@ -1,6 +1,6 @@
 # generate_report.py
 
-import pandas as pd
+from src.data_access import load_trips
 from evidently.report import Report
 from evidently.metric_preset import DataDriftPreset, TargetDriftPreset
 
@@ -8,16 +8,8 @@ print("--- Running Inside a Clean Docker Container ---")
 
 try:
     print("Loading reference and current data...")
-    reference_data = pd.read_parquet('data/raw/green_tripdata_2023-01.parquet')
-    current_data = pd.read_parquet('data/raw/green_tripdata_2023-02.parquet')
-
-    def preprocess(df):
-        df['duration'] = (df.lpep_dropoff_datetime - df.lpep_pickup_datetime).dt.total_seconds() / 60
-        df = df[(df.duration >= 1) & (df.duration <= 60)]
-        return df
-
-    reference_data = preprocess(reference_data)
-    current_data = preprocess(current_data)
+    reference_data = load_trips('green_tripdata_2023-01.parquet')
+    current_data = load_trips('green_tripdata_2023-02.parquet')
 
     print("Generating data drift report...")
     report = Report(metrics=[DataDriftPreset(), TargetDriftPreset(stat_test='ks')])
@@ -1,9 +1,9 @@
-import pandas as pd
 import numpy as np
 from scipy import stats
 import json
 from datetime import datetime
 import warnings
+from src.data_access import load_trips
 warnings.filterwarnings('ignore')
 
 def calculate_basic_drift_stats(reference_data, current_data):
@@ -106,23 +106,13 @@ def main():
     print("🚀 Starting Data Drift Monitoring...")
 
     try:
+        numeric_features = ['trip_distance', 'duration', 'fare_amount', 'tip_amount', 'total_amount']
+
         print("📊 Loading reference data (January)...")
-        reference_data = pd.read_parquet('data/raw/green_tripdata_2023-01.parquet')
+        ref_processed = load_trips('green_tripdata_2023-01.parquet', columns=numeric_features).dropna()
 
         print("📊 Loading current data (February)...")
-        current_data = pd.read_parquet('data/raw/green_tripdata_2023-02.parquet')
-
-        print("🔄 Preprocessing data...")
-        def preprocess(df):
-            df = df.copy()  # Create a copy to avoid warnings
-            df['duration'] = (df.lpep_dropoff_datetime - df.lpep_pickup_datetime).dt.total_seconds() / 60
-            df = df[(df.duration >= 1) & (df.duration <= 60)]
-            numeric_features = ['trip_distance', 'duration', 'fare_amount', 'tip_amount', 'total_amount']
-            available_features = [col for col in numeric_features if col in df.columns]
-            return df[available_features].dropna()
-
-        ref_processed = preprocess(reference_data)
-        cur_processed = preprocess(current_data)
+        cur_processed = load_trips('green_tripdata_2023-02.parquet', columns=numeric_features).dropna()
 
         print("🔍 Calculating drift statistics...")
         drift_results = calculate_basic_drift_stats(ref_processed, cur_processed)
@@ -0,0 +1,75 @@
+# src/benchmark_payload.py
+
+import json
+import time
+import numpy as np
+import pyarrow as pa
+from sklearn.feature_extraction import DictVectorizer
+
+from src import payload
+from src.predict import TripInput
+
+def make_trips(n_rows: int, seed: int = 42):
+    """Generates synthetic trips with the same columns the API receives."""
+    rng = np.random.default_rng(seed)
+    return {
+        'PULocationID': rng.integers(1, 266, n_rows).astype(str),
+        'DOLocationID': rng.integers(1, 266, n_rows).astype(str),
+        'trip_distance': rng.gamma(2.0, 1.5, n_rows),
+    }
+
+def fit_vectorizer(trips):
+    """Fits a DictVectorizer the same way src/process_data.py does."""
+    records = [
+        {'PULocationID': str(pu), 'DOLocationID': str(do), 'trip_distance': float(dist)}
+        for pu, do, dist in zip(trips['PULocationID'], trips['DOLocationID'], trips['trip_distance'])
+    ]
+    dv = DictVectorizer()
+    dv.fit(records)
+    return dv
+
+def json_path(body: bytes, dv):
+    trips = [TripInput(**trip) for trip in payload.decode_json(body)]
+    return dv.transform([trip.dict() for trip in trips])
+
+def arrow_path(body: bytes, dv):
+    columns = payload.validate_trips(payload.decode_arrow(body))
+    return payload.encode_features(columns, dv)
+
+def time_it(fn, *args, repeat: int = 5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+def run_benchmark(n_rows: int = 100_000):
+    """Compares JSON + TripInput decoding with the Arrow IPC columnar path."""
+    trips = make_trips(n_rows)
+    dv = fit_vectorizer(trips)
+
+    json_body = json.dumps([
+        {'PULocationID': str(pu), 'DOLocationID': str(do), 'trip_distance': float(dist)}
+        for pu, do, dist in zip(trips['PULocationID'], trips['DOLocationID'], trips['trip_distance'])
+    ]).encode()
+
+    table = pa.table(trips)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    arrow_body = sink.getvalue().to_pybytes()
+
+    json_time, X_json = time_it(json_path, json_body, dv)
+    arrow_time, X_arrow = time_it(arrow_path, arrow_body, dv)
+
+    # Both paths must feed the model the same features
+    assert (X_json != X_arrow).nnz == 0, "Arrow features differ from DictVectorizer output"
+
+    print(f"Rows: {n_rows}")
+    print(f"JSON  body: {len(json_body) / 1e6:.2f} MB, decode+encode: {json_time * 1000:.1f} ms")
+    print(f"Arrow body: {len(arrow_body) / 1e6:.2f} MB, decode+encode: {arrow_time * 1000:.1f} ms")
+    print(f"Speedup: {json_time / arrow_time:.1f}x")
+
+if __name__ == "__main__":
+    run_benchmark()
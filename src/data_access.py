@@ -0,0 +1,115 @@
+# src/data_access.py
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+import pandas as pd
+import pyarrow.parquet as pq
+
+RAW_DIR = "data/raw"
+CACHE_DIR = "data/cache"
+
+# Trip duration bounds (minutes) shared by the pipeline and monitoring
+MIN_DURATION = 1
+MAX_DURATION = 60
+
+# Bump whenever clean_trips() changes so cached months are rebuilt
+CLEANING_VERSION = 1
+
+def file_hash(path: str, chunk_size: int = 1 << 20) -> str:
+    """Returns the md5 of a file, the same hash DVC records in dvc.lock."""
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+def _atomic_write(path: str, write):
+    """Calls write(tmp_path) on a unique temporary file, then moves it into place.
+
+    Concurrent writers each get their own temporary file, so readers only
+    ever see a complete file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def cached_file_hash(raw_path: str, cache_dir: str = CACHE_DIR) -> str:
+    """Returns the md5 of a raw file, rehashing only when its size or mtime changed."""
+    stat = os.stat(raw_path)
+    sidecar = os.path.join(cache_dir, f"{os.path.basename(raw_path)}.md5.json")
+    try:
+        with open(sidecar) as f:
+            entry = json.load(f)
+        if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["md5"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    md5 = file_hash(raw_path)
+    entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "md5": md5}
+
+    def write(tmp_path):
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    _atomic_write(sidecar, write)
+    return md5
+
+def clean_trips(df: pd.DataFrame) -> pd.DataFrame:
+    """Adds the duration in minutes and drops trips outside the allowed range."""
+    df['duration'] = (df.lpep_dropoff_datetime - df.lpep_pickup_datetime).dt.total_seconds() / 60
+    return df[(df.duration >= MIN_DURATION) & (df.duration <= MAX_DURATION)]
+
+def cached_month_path(filename: str, raw_dir: str = RAW_DIR, cache_dir: str = CACHE_DIR) -> str:
+    """Returns the cleaned parquet file for a raw month, building it on a cache miss.
+
+    The cache file name carries the md5 of the raw file together with the
+    cleaning version and duration bounds, so a re-downloaded month or a change
+    to the cleaning rules rebuilds the cache instead of serving it stale.
+    """
+    raw_path = os.path.join(raw_dir, filename)
+    stem = os.path.splitext(filename)[0]
+    cleaning_key = f"v{CLEANING_VERSION}-{MIN_DURATION}-{MAX_DURATION}"
+    cache_path = os.path.join(cache_dir, f"{stem}-{cached_file_hash(raw_path, cache_dir)}-{cleaning_key}.parquet")
+
+    if not os.path.exists(cache_path):
+        start = time.time()
+        df = clean_trips(pd.read_parquet(raw_path))
+        os.makedirs(cache_dir, exist_ok=True)
+        _atomic_write(cache_path, lambda tmp_path: df.to_parquet(tmp_path, index=False))
+        memory_mb = df.memory_usage(deep=True).sum() / 1e6
+        print(f"Cached cleaned {filename}: {len(df)} trips, {len(df.columns)} columns, "
+              f"{memory_mb:.1f} MB in {time.time() - start:.2f}s")
+
+    return cache_path
+
+def load_trips(filename: str, columns=None, filters=None,
+               raw_dir: str = RAW_DIR, cache_dir: str = CACHE_DIR) -> pd.DataFrame:
+    """Loads the cleaned trips of one month, reading only the requested columns.
+
+    Duration and the duration filter are computed once per raw file and kept
+    in the cache. `columns` is projected and `filters` (pyarrow DNF, e.g.
+    [('trip_distance', '>', 0)]) is pushed down into the parquet reader.
+    Requested columns that the month does not have are skipped.
+    """
+    start = time.time()
+    cache_path = cached_month_path(filename, raw_dir, cache_dir)
+
+    if columns is not None:
+        available = set(pq.read_schema(cache_path).names)
+        columns = [col for col in columns if col in available]
+
+    df = pd.read_parquet(cache_path, columns=columns, filters=filters)
+    memory_mb = df.memory_usage(deep=True).sum() / 1e6
+    print(f"Loaded {filename}: {len(df)} trips, {len(df.columns)} columns, "
+          f"{memory_mb:.1f} MB in {time.time() - start:.2f}s")
+    return df
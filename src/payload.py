@@ -0,0 +1,177 @@
+# src/payload.py
+
+import json
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import scipy.sparse as sp
+
+try:
+    import msgpack
+except ImportError:  # msgpack bodies are optional
+    msgpack = None
+
+# Supported batch content types
+JSON = "application/json"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack")
+
+# Same fields as TripInput in src/predict.py
+CATEGORICAL = ['PULocationID', 'DOLocationID']
+NUMERICAL = ['trip_distance']
+
+OUTPUT_COLUMN = 'predicted_duration_minutes'
+
+
+class PayloadError(ValueError):
+    """Raised when a batch payload does not match the TripInput schema."""
+
+
+def media_type(content_type):
+    """Strips parameters (e.g. charset) from a Content-Type header."""
+    return (content_type or JSON).split(";")[0].strip().lower()
+
+
+def supported_types() -> tuple:
+    """Content types this server can decode; msgpack only when it is installed."""
+    types = (JSON, ARROW_STREAM)
+    if msgpack is not None:
+        types += MSGPACK_TYPES
+    return types
+
+
+def decode_arrow(body: bytes) -> pa.Table:
+    """Reads an Arrow IPC stream without copying the column buffers."""
+    try:
+        reader = pa.ipc.open_stream(pa.py_buffer(body))
+        return reader.read_all()
+    except pa.ArrowInvalid as e:
+        raise PayloadError(f"Invalid Arrow IPC stream: {e}")
+
+
+def decode_msgpack(body: bytes) -> pa.Table:
+    """Reads a msgpack map of column name -> list of values."""
+    if msgpack is None:
+        raise PayloadError("msgpack payloads are not supported on this server")
+    try:
+        columns = msgpack.unpackb(body, raw=False)
+    except Exception as e:
+        raise PayloadError(f"Invalid msgpack body: {e}")
+    if not isinstance(columns, dict):
+        raise PayloadError("msgpack body must be a map of column name -> list")
+    try:
+        return pa.table({name: pa.array(values) for name, values in columns.items()})
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError) as e:
+        raise PayloadError(f"Invalid msgpack columns: {e}")
+
+
+def decode_json(body: bytes) -> list:
+    """Reads a JSON list of trip objects; each is validated as a TripInput by the caller."""
+    try:
+        trips = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise PayloadError(f"Invalid JSON body: {e}")
+    if not isinstance(trips, list) or not all(isinstance(trip, dict) for trip in trips):
+        raise PayloadError("JSON body must be a list of trip objects")
+    if not trips:
+        raise PayloadError("Payload contains no trips")
+    return trips
+
+
+def _is_string(data_type) -> bool:
+    return pa.types.is_string(data_type) or pa.types.is_large_string(data_type)
+
+
+def validate_trips(table: pa.Table) -> dict:
+    """Applies the TripInput schema column-wise and returns normalized columns.
+
+    Location IDs must be strings, plain or dictionary-encoded; like TripInput
+    under pydantic v2, integers are rejected rather than coerced.
+    trip_distance must be castable to float64. Nulls are rejected in every field.
+    """
+    missing = [col for col in CATEGORICAL + NUMERICAL if col not in table.column_names]
+    if missing:
+        raise PayloadError(f"Missing required column(s): {', '.join(missing)}")
+    if table.num_rows == 0:
+        raise PayloadError("Payload contains no trips")
+
+    columns = {}
+    for col in CATEGORICAL:
+        values = table.column(col)
+        if values.null_count:
+            raise PayloadError(f"Column '{col}' contains {values.null_count} null value(s)")
+        data_type = values.type
+        if pa.types.is_dictionary(data_type):
+            data_type = data_type.value_type
+        if not _is_string(data_type):
+            raise PayloadError(f"Column '{col}' must be string, got {values.type}")
+        columns[col] = values
+
+    for col in NUMERICAL:
+        values = table.column(col)
+        if values.null_count:
+            raise PayloadError(f"Column '{col}' contains {values.null_count} null value(s)")
+        try:
+            values = pc.cast(values, pa.float64())
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+            raise PayloadError(f"Column '{col}' is not a valid float: {e}")
+        # Zero-copy when the client already sent float64 in a single chunk
+        columns[col] = values.combine_chunks().to_numpy(zero_copy_only=False)
+
+    return columns
+
+
+def encode_features(columns: dict, dv) -> sp.csr_matrix:
+    """Builds the same sparse matrix as dv.transform() without per-row dicts.
+
+    Categorical chunks are dictionary-encoded in Arrow (or used as-is when the
+    client already sent dictionaries), so the vocabulary lookup only runs once
+    per distinct location ID and chunk. Unknown IDs are dropped, matching
+    DictVectorizer.
+    """
+    vocab = dv.vocabulary_
+    n_rows = len(columns[NUMERICAL[0]])
+    row_ids = np.arange(n_rows, dtype=np.int64)
+
+    rows, cols, data = [], [], []
+    for col in CATEGORICAL:
+        offset = 0
+        for chunk in columns[col].chunks:
+            if not pa.types.is_dictionary(chunk.type):
+                chunk = chunk.dictionary_encode()
+            lookup = np.array(
+                [vocab.get(f"{col}{dv.separator}{value}", -1) for value in chunk.dictionary.to_pylist()],
+                dtype=np.int64,
+            )
+            feature_idx = lookup[chunk.indices.to_numpy(zero_copy_only=False)]
+            known = feature_idx >= 0
+            rows.append(row_ids[offset:offset + len(chunk)][known])
+            cols.append(feature_idx[known])
+            data.append(np.ones(known.sum(), dtype=dv.dtype))
+            offset += len(chunk)
+
+    for col in NUMERICAL:
+        if col in vocab:
+            rows.append(row_ids)
+            cols.append(np.full(n_rows, vocab[col], dtype=np.int64))
+            data.append(columns[col].astype(dv.dtype, copy=False))
+
+    return sp.csr_matrix(
+        (np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(n_rows, len(vocab)),
+        dtype=dv.dtype,
+    )
+
+
+def encode_arrow(predictions: np.ndarray) -> bytes:
+    """Writes predictions as a single-column Arrow IPC stream."""
+    table = pa.table({OUTPUT_COLUMN: pa.array(np.asarray(predictions, dtype=np.float64))})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_msgpack(predictions: np.ndarray) -> bytes:
+    """Writes predictions as a msgpack map with a single column."""
+    return msgpack.packb({OUTPUT_COLUMN: np.asarray(predictions, dtype=np.float64).tolist()})
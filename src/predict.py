@@ -1,13 +1,17 @@
 import os
 import pickle
 import mlflow
-from fastapi import FastAPI, HTTPException, Response
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
 import yaml
 from datetime import datetime
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
 import time
 from functools import wraps
+import json
+import numpy as np
+from src import payload
 
 # Prometheus metrics
 REQUEST_COUNT = Counter('api_requests_total', 'Total API requests', ['method', 'endpoint', 'status'])
@@ -101,3 +105,82 @@ def predict_duration(trip: TripInput):
         total_duration = time.time() - start_time
         REQUEST_DURATION.observe(total_duration)
         ACTIVE_PREDICTIONS.dec()
+
+def observe_histogram(histogram, values):
+    """Bulk equivalent of histogram.observe() for every value, binned with numpy.
+
+    Uses prometheus_client internals; if they change, falls back to observe().
+    """
+    values = np.asarray(values, dtype=np.float64)
+    try:
+        upper_bounds, buckets, total = histogram._upper_bounds, histogram._buckets, histogram._sum
+    except AttributeError:
+        for value in values:
+            histogram.observe(value)
+        return
+    # observe() counts a value in the first bucket whose upper bound is >= value
+    bucket_idx = np.searchsorted(upper_bounds, values, side='left')
+    counts = np.bincount(bucket_idx, minlength=len(upper_bounds))
+    total.inc(float(values.sum()))
+    for bucket, count in zip(buckets, counts):
+        if count:
+            bucket.inc(int(count))
+
+def _predict_body(content_type, body):
+    """Decodes, validates and predicts a batch body; runs in the threadpool."""
+    if content_type == payload.ARROW_STREAM:
+        columns = payload.validate_trips(payload.decode_arrow(body))
+        X_trips = payload.encode_features(columns, dv)
+    elif content_type in payload.MSGPACK_TYPES:
+        columns = payload.validate_trips(payload.decode_msgpack(body))
+        X_trips = payload.encode_features(columns, dv)
+    else:
+        trips = [TripInput(**trip) for trip in payload.decode_json(body)]
+        X_trips = dv.transform([trip.dict() for trip in trips])
+    return model.predict(X_trips)
+
+@app.post("/predict/batch")
+async def predict_batch(request: Request):
+    """Batch predictions; the body format (JSON, Arrow IPC or msgpack) follows Content-Type."""
+    start_time = time.time()
+    ACTIVE_PREDICTIONS.inc()
+    content_type = payload.media_type(request.headers.get("content-type"))
+
+    try:
+        if content_type not in payload.supported_types():
+            REQUEST_COUNT.labels(method='POST', endpoint='/predict/batch', status='error').inc()
+            raise HTTPException(status_code=415, detail=f"Unsupported Content-Type: {content_type}")
+
+        body = await request.body()
+
+        # Decoding and validation are as costly as the model for large batches,
+        # so keep all of it off the event loop
+        pred_start = time.time()
+        predictions = await run_in_threadpool(_predict_body, content_type, body)
+        pred_duration = time.time() - pred_start
+
+        # Record metrics
+        PREDICTION_DURATION.observe(pred_duration)
+        MODEL_PREDICTIONS_TOTAL.inc(len(predictions))
+        observe_histogram(PREDICTION_VALUES, predictions)
+        REQUEST_COUNT.labels(method='POST', endpoint='/predict/batch', status='success').inc()
+
+        if content_type == payload.ARROW_STREAM:
+            return Response(payload.encode_arrow(predictions), media_type=payload.ARROW_STREAM)
+        if content_type in payload.MSGPACK_TYPES:
+            return Response(payload.encode_msgpack(predictions), media_type=content_type)
+        return {payload.OUTPUT_COLUMN: predictions.tolist()}
+
+    except HTTPException:
+        raise
+    except (payload.PayloadError, ValidationError, json.JSONDecodeError) as e:
+        REQUEST_COUNT.labels(method='POST', endpoint='/predict/batch', status='error').inc()
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        REQUEST_COUNT.labels(method='POST', endpoint='/predict/batch', status='error').inc()
+        raise HTTPException(status_code=400, detail=str(e))
+
+    finally:
+        total_duration = time.time() - start_time
+        REQUEST_DURATION.observe(total_duration)
+        ACTIVE_PREDICTIONS.dec()
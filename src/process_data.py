@@ -1,30 +1,23 @@
 # src/process_data.py
 
-import pandas as pd
 from sklearn.feature_extraction import DictVectorizer
 import pickle
 import os
+from src.data_access import load_trips
 
 def preprocess_data(input_dir: str, output_dir: str):
     """Reads raw parquet files, preprocesses them, and saves artifacts."""
     
     print("Starting data processing...")
     
-    # Read the raw data
-    df_train = pd.read_parquet(os.path.join(input_dir, 'green_tripdata_2023-01.parquet'))
-    df_val = pd.read_parquet(os.path.join(input_dir, 'green_tripdata_2023-02.parquet'))
-
-    # Feature Engineering: Calculate trip duration in minutes
-    df_train['duration'] = (df_train.lpep_dropoff_datetime - df_train.lpep_pickup_datetime).dt.total_seconds() / 60
-    df_val['duration'] = (df_val.lpep_dropoff_datetime - df_val.lpep_pickup_datetime).dt.total_seconds() / 60
-
-    # Filter outliers
-    df_train = df_train[(df_train.duration >= 1) & (df_train.duration <= 60)].copy()
-    df_val = df_val[(df_val.duration >= 1) & (df_val.duration <= 60)].copy()
-
     # Define categorical and numerical features
     categorical = ['PULocationID', 'DOLocationID']
     numerical = ['trip_distance']
+
+    # Read the cleaned trips (duration computed and outliers filtered) for the needed columns only
+    columns = categorical + numerical + ['duration']
+    df_train = load_trips('green_tripdata_2023-01.parquet', columns=columns, raw_dir=input_dir)
+    df_val = load_trips('green_tripdata_2023-02.parquet', columns=columns, raw_dir=input_dir)
     
     df_train[categorical] = df_train[categorical].fillna(-1).astype('int').astype('str')
     df_val[categorical] = df_val[categorical].fillna(-1).astype('int').astype('str')
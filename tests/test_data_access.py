@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+from src import data_access
+
+FILENAME = 'green_tripdata_2023-01.parquet'
+
+def write_raw(raw_dir, n_rows=500, seed=0):
+    rng = np.random.default_rng(seed)
+    pickup = pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 86400, n_rows), unit='s')
+    df = pd.DataFrame({
+        'lpep_pickup_datetime': pickup,
+        'lpep_dropoff_datetime': pickup + pd.to_timedelta(rng.integers(0, 5400, n_rows), unit='s'),
+        'PULocationID': rng.integers(1, 266, n_rows),
+        'DOLocationID': rng.integers(1, 266, n_rows),
+        'trip_distance': rng.gamma(2.0, 1.5, n_rows),
+    })
+    raw_dir.mkdir(exist_ok=True)
+    df.to_parquet(raw_dir / FILENAME)
+    return df
+
+@pytest.fixture
+def dirs(tmp_path):
+    return tmp_path / 'raw', tmp_path / 'cache'
+
+def test_matches_inline_duration_filter(dirs):
+    raw_dir, cache_dir = dirs
+    df = write_raw(raw_dir)
+    df['duration'] = (df.lpep_dropoff_datetime - df.lpep_pickup_datetime).dt.total_seconds() / 60
+    expected = df[(df.duration >= 1) & (df.duration <= 60)].reset_index(drop=True)
+
+    loaded = data_access.load_trips(FILENAME, raw_dir=str(raw_dir), cache_dir=str(cache_dir))
+    pd.testing.assert_frame_equal(loaded, expected, check_dtype=False)
+
+def test_second_load_reuses_cache(dirs, monkeypatch):
+    raw_dir, cache_dir = dirs
+    write_raw(raw_dir)
+    data_access.load_trips(FILENAME, raw_dir=str(raw_dir), cache_dir=str(cache_dir))
+
+    def fail(df):
+        raise AssertionError("cache was rebuilt")
+
+    monkeypatch.setattr(data_access, 'clean_trips', fail)
+    monkeypatch.setattr(data_access, 'file_hash', fail)
+    data_access.load_trips(FILENAME, raw_dir=str(raw_dir), cache_dir=str(cache_dir))
+
+def test_rewritten_raw_file_gets_new_cache_key(dirs):
+    raw_dir, cache_dir = dirs
+    write_raw(raw_dir)
+    first = data_access.cached_month_path(FILENAME, str(raw_dir), str(cache_dir))
+
+    write_raw(raw_dir, n_rows=400, seed=1)
+    second = data_access.cached_month_path(FILENAME, str(raw_dir), str(cache_dir))
+
+    assert first != second
+    assert len(pd.read_parquet(second)) < len(pd.read_parquet(first))
+
+def test_cleaning_version_gets_new_cache_key(dirs, monkeypatch):
+    raw_dir, cache_dir = dirs
+    write_raw(raw_dir)
+    first = data_access.cached_month_path(FILENAME, str(raw_dir), str(cache_dir))
+
+    monkeypatch.setattr(data_access, 'CLEANING_VERSION', data_access.CLEANING_VERSION + 1)
+    second = data_access.cached_month_path(FILENAME, str(raw_dir), str(cache_dir))
+
+    assert first != second
+
+def test_missing_columns_are_skipped(dirs):
+    raw_dir, cache_dir = dirs
+    write_raw(raw_dir)
+    loaded = data_access.load_trips(FILENAME, columns=['trip_distance', 'fare_amount', 'duration'],
+                                    raw_dir=str(raw_dir), cache_dir=str(cache_dir))
+    assert list(loaded.columns) == ['trip_distance', 'duration']
+
+def test_filters_are_applied(dirs):
+    raw_dir, cache_dir = dirs
+    write_raw(raw_dir)
+    loaded = data_access.load_trips(FILENAME, columns=['duration'], filters=[('duration', '>', 30)],
+                                    raw_dir=str(raw_dir), cache_dir=str(cache_dir))
+    assert len(loaded) > 0
+    assert (loaded.duration > 30).all()
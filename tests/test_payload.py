@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+DictVectorizer = pytest.importorskip("sklearn.feature_extraction").DictVectorizer
+
+from src import payload
+
+TRAIN_TRIPS = [
+    {'PULocationID': '142', 'DOLocationID': '236', 'trip_distance': 1.2},
+    {'PULocationID': '132', 'DOLocationID': '138', 'trip_distance': 11.5},
+    {'PULocationID': '161', 'DOLocationID': '142', 'trip_distance': 0.8},
+]
+
+@pytest.fixture
+def dv():
+    return DictVectorizer().fit(TRAIN_TRIPS)
+
+def columns_to_records(columns):
+    return [
+        {'PULocationID': pu, 'DOLocationID': do, 'trip_distance': dist}
+        for pu, do, dist in zip(columns['PULocationID'], columns['DOLocationID'], columns['trip_distance'])
+    ]
+
+def assert_matches_dv(table, records, dv):
+    X = payload.encode_features(payload.validate_trips(table), dv)
+    expected = dv.transform(records)
+    assert X.shape == expected.shape
+    np.testing.assert_array_equal(X.toarray(), expected.toarray())
+
+def test_matches_dv_transform_with_unknown_ids(dv):
+    columns = {
+        'PULocationID': ['142', '999', '161', '132'],
+        'DOLocationID': ['236', '138', '1', '142'],
+        'trip_distance': [1.0, 2.5, 0.0, 7.25],
+    }
+    assert_matches_dv(pa.table(columns), columns_to_records(columns), dv)
+
+def test_matches_dv_transform_for_multi_chunk_and_dictionary_columns(dv):
+    first = {'PULocationID': ['142', '132'], 'DOLocationID': ['236', '999'], 'trip_distance': [1.0, 2.0]}
+    second = {'PULocationID': ['161', '7'], 'DOLocationID': ['138', '142'], 'trip_distance': [3.0, 4.0]}
+    table = pa.concat_tables([pa.table(first), pa.table(second)])
+    table = table.set_column(0, 'PULocationID', pa.chunked_array(
+        [chunk.dictionary_encode() for chunk in table.column('PULocationID').chunks]))
+    assert table.column('DOLocationID').num_chunks == 2
+
+    records = columns_to_records(first) + columns_to_records(second)
+    assert_matches_dv(table, records, dv)
+
+def test_integer_ids_are_rejected_like_trip_input():
+    table = pa.table({'PULocationID': [142], 'DOLocationID': ['236'], 'trip_distance': [1.0]})
+    with pytest.raises(payload.PayloadError, match="must be string"):
+        payload.validate_trips(table)
+
+def test_nulls_are_rejected():
+    table = pa.table({'PULocationID': ['142', None], 'DOLocationID': ['236', '138'], 'trip_distance': [1.0, 2.0]})
+    with pytest.raises(payload.PayloadError, match="null"):
+        payload.validate_trips(table)
+
+def test_missing_columns_are_rejected():
+    table = pa.table({'PULocationID': ['142'], 'trip_distance': [1.0]})
+    with pytest.raises(payload.PayloadError, match="DOLocationID"):
+        payload.validate_trips(table)
+
+def test_msgpack_round_trip(dv):
+    msgpack = pytest.importorskip("msgpack")
+    columns = {'PULocationID': ['142', '132'], 'DOLocationID': ['138', '5'], 'trip_distance': [1, 2.5]}
+    table = payload.decode_msgpack(msgpack.packb(columns))
+    assert_matches_dv(table, columns_to_records(columns), dv)
+
+    body = payload.encode_msgpack(np.array([12.5, 3.0]))
+    assert msgpack.unpackb(body) == {payload.OUTPUT_COLUMN: [12.5, 3.0]}
+
+def test_arrow_round_trip():
+    body = payload.encode_arrow(np.array([12.5, 3.0]))
+    table = payload.decode_arrow(body)
+    assert table.column(payload.OUTPUT_COLUMN).to_pylist() == [12.5, 3.0]
+
+def test_invalid_json_is_a_payload_error():
+    with pytest.raises(payload.PayloadError):
+        payload.decode_json(b'{"PULocationID": "142"}')
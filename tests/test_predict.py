@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pytest.importorskip("mlflow")
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient
+from prometheus_client import CollectorRegistry, Histogram, generate_latest
+from sklearn.feature_extraction import DictVectorizer
+from sklearn.linear_model import LinearRegression
+
+from src import payload, predict
+
+TRIPS = [
+    {'PULocationID': '142', 'DOLocationID': '236', 'trip_distance': 1.2},
+    {'PULocationID': '132', 'DOLocationID': '138', 'trip_distance': 11.5},
+    {'PULocationID': '161', 'DOLocationID': '142', 'trip_distance': 0.8},
+]
+
+@pytest.fixture
+def client(monkeypatch):
+    dv = DictVectorizer().fit(TRIPS)
+    model = LinearRegression().fit(dv.transform(TRIPS), [8.0, 35.0, 5.0])
+    monkeypatch.setattr(predict, 'dv', dv)
+    monkeypatch.setattr(predict, 'model', model)
+    # Not used as a context manager, so the MLflow startup hook does not run
+    return TestClient(predict.app)
+
+def expected_predictions():
+    return predict.model.predict(predict.dv.transform(TRIPS))
+
+def arrow_body(columns):
+    table = pa.table(columns)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def trip_columns():
+    return {key: [trip[key] for trip in TRIPS] for key in TRIPS[0]}
+
+def test_json_batch_returns_json(client):
+    response = client.post("/predict/batch", json=TRIPS)
+    assert response.status_code == 200
+    np.testing.assert_allclose(response.json()[payload.OUTPUT_COLUMN], expected_predictions())
+
+def test_arrow_batch_returns_arrow(client):
+    response = client.post("/predict/batch", content=arrow_body(trip_columns()),
+                           headers={"Content-Type": payload.ARROW_STREAM})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == payload.ARROW_STREAM
+    table = payload.decode_arrow(response.content)
+    np.testing.assert_allclose(table.column(payload.OUTPUT_COLUMN).to_numpy(), expected_predictions())
+
+def test_msgpack_batch_returns_msgpack(client):
+    msgpack = pytest.importorskip("msgpack")
+    response = client.post("/predict/batch", content=msgpack.packb(trip_columns()),
+                           headers={"Content-Type": "application/msgpack"})
+    assert response.status_code == 200
+    np.testing.assert_allclose(msgpack.unpackb(response.content)[payload.OUTPUT_COLUMN], expected_predictions())
+
+def test_msgpack_without_package_is_unsupported(client, monkeypatch):
+    monkeypatch.setattr(payload, 'msgpack', None)
+    response = client.post("/predict/batch", content=b"\x80", headers={"Content-Type": "application/msgpack"})
+    assert response.status_code == 415
+
+def test_unknown_content_type_is_unsupported(client):
+    response = client.post("/predict/batch", content=b"a,b", headers={"Content-Type": "text/csv"})
+    assert response.status_code == 415
+
+def test_payload_error_is_422(client):
+    columns = trip_columns()
+    columns['PULocationID'] = [142, 132, 161]
+    response = client.post("/predict/batch", content=arrow_body(columns),
+                           headers={"Content-Type": payload.ARROW_STREAM})
+    assert response.status_code == 422
+
+def test_validation_error_is_422(client):
+    response = client.post("/predict/batch", json=[{'PULocationID': '142', 'trip_distance': 1.0}])
+    assert response.status_code == 422
+
+def test_server_error_is_400(client, monkeypatch):
+    class BrokenModel:
+        def predict(self, X):
+            raise ValueError("shape mismatch")
+
+    monkeypatch.setattr(predict, 'model', BrokenModel())
+    response = client.post("/predict/batch", json=TRIPS)
+    assert response.status_code == 400
+
+def test_observe_histogram_matches_observe():
+    values = np.array([0.1, 5, 5.0001, 10, 59.9, 60, 100, -3])
+    buckets = [5, 10, 15, 20, 30, 45, 60, 90]
+    registries = CollectorRegistry(), CollectorRegistry()
+    looped, bulk = (Histogram('prediction_values', 'test', buckets=buckets, registry=r) for r in registries)
+
+    for value in values:
+        looped.observe(value)
+    predict.observe_histogram(bulk, values)
+
+    def samples(registry):
+        return [line for line in generate_latest(registry).decode().splitlines() if '_created' not in line]
+
+    assert samples(registries[1]) == samples(registries[0])
+
+def test_observe_histogram_falls_back_to_observe():
+    class PublicHistogram:
+        def __init__(self):
+            self.values = []
+
+        def observe(self, value):
+            self.values.append(value)
+
+    histogram = PublicHistogram()
+    predict.observe_histogram(histogram, [1.0, 2.0])
+    assert histogram.values == [1.0, 2.0]